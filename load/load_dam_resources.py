@@ -2,83 +2,210 @@
 
 import os
 import sys
-import json
+import logging
+import argparse
+import tempfile
+import ijson
+from itertools import chain, islice
+from typing import Iterable, Iterator
+from pydantic import ValidationError
 
 # Add scripts directory to path for imports
 PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+sys.path.insert(0, PROJECT_ROOT)
 
-from db_utils import DatabaseConnection
+from db_utils import BATCH_SIZE, LOCAL_INFILE_DIR, DatabaseConnection
+from schemas import DamResourceList
 
 INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "output_data", "dam_resources.json")
 
+logger = logging.getLogger(__name__)
+
+# Seeding an empty table with at least this many records uses LOAD DATA (MySQL only)
+BULK_SEED_THRESHOLD = 10000
+
+# Duplicate (dam_id, date) rows are skipped by the uq_dam_date unique key. On
+# MySQL this uses a no-op ON DUPLICATE KEY UPDATE rather than INSERT IGNORE,
+# which would also silently drop rows failing the dams foreign key
+INSERT_SQL = {
+    "local": (
+        "INSERT INTO dam_resources "
+        "(dam_id, date, storage_volume, percentage_full, storage_inflow, storage_release) "
+        "VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE dam_id = dam_id"
+    ),
+    "supabase": (
+        "INSERT INTO dam_resources "
+        "(dam_id, date, storage_volume, percentage_full, storage_inflow, storage_release) "
+        "VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON CONFLICT (dam_id, date) DO NOTHING"
+    ),
+}
+
+# MySQL warning code for a row skipped by a duplicate key
+ER_DUP_ENTRY = 1062
+
+LOAD_DATA_SQL = (
+    "LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE dam_resources "
+    "FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+    "(dam_id, date, storage_volume, percentage_full, storage_inflow, storage_release)"
+)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Stream records from a JSON array file without loading it all into memory."""
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item")
+
+
+def iter_batches(records: Iterable[dict], size: int = BATCH_SIZE) -> Iterator[list[dict]]:
+    """Group an iterable of records into lists of at most size records."""
+    it = iter(records)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def to_rows(batch: list[dict]) -> list[tuple]:
+    """Validate a batch of records and convert them to dam_resources row tuples."""
+    return [
+        (
+            record.dam_id,
+            record.date,
+            record.storage_volume,
+            record.percentage_full,
+            record.storage_inflow,
+            record.storage_release,
+        )
+        for record in DamResourceList.validate_python(batch)
+    ]
+
+
+def get_last_loaded_dates(cursor) -> dict[str, str]:
+    """
+    Get the latest loaded date for each dam in one query, as an ISO string.
+    The result has one row per dam, however much history each dam has.
+    """
+    cursor.execute("SELECT dam_id, MAX(date) FROM dam_resources GROUP BY dam_id")
+    # Iterate the cursor rather than fetchall() to avoid an intermediate row list
+    return {dam_id: last_date.isoformat() for dam_id, last_date in cursor}
 
-def get_existing_dates(cursor, dam_id: str) -> set:
-    """Get all existing dates for a dam_id to avoid duplicates."""
-    cursor.execute(
-        "SELECT date FROM dam_resources WHERE dam_id = %s",
-        (dam_id,)
-    )
-    return {row[0] for row in cursor.fetchall()}
 
+def can_bulk_seed(cursor) -> bool:
+    """Check the server accepts LOAD DATA LOCAL and dam_resources is still empty."""
+    cursor.execute("SELECT @@GLOBAL.local_infile, EXISTS(SELECT 1 FROM dam_resources)")
+    local_infile, has_rows = cursor.fetchone()
+    return bool(local_infile) and not has_rows
 
-def load_dam_resources(records: list[dict]):
+
+def bulk_seed(cursor, batches: Iterable[list[dict]]) -> tuple[int, int]:
+    """
+    Seed dam_resources with LOAD DATA LOCAL INFILE, bypassing per-statement parsing.
+    Rows are streamed to a TSV file in LOCAL_INFILE_DIR, the only directory the
+    connection may send files from. Returns (processed, inserted).
+
+    LOAD DATA LOCAL turns row errors into warnings, skipping rows that fail a
+    constraint and clamping invalid values, where the INSERT path would raise.
+    Any warning other than a duplicate (dam_id, date) therefore raises instead.
+    """
+    os.makedirs(LOCAL_INFILE_DIR, exist_ok=True)
+    processed = 0
+
+    f = tempfile.NamedTemporaryFile(
+        "w", dir=LOCAL_INFILE_DIR, suffix=".tsv", delete=False, encoding="utf-8", newline=""
+    )
+    try:
+        with f:
+            for batch in batches:
+                rows = to_rows(batch)
+                for row in rows:
+                    # LOAD DATA reads \N as NULL; an empty field would load as 0
+                    f.write("\t".join("\\N" if v is None else str(v) for v in row) + "\n")
+                processed += len(rows)
+
+        cursor.execute(LOAD_DATA_SQL, (f.name,))
+        inserted = cursor.rowcount
+        warning_count = cursor.warning_count
+    finally:
+        os.remove(f.name)
+
+    if warning_count:
+        cursor.execute("SHOW WARNINGS")
+        warnings = cursor.fetchall()
+        rejected = [message for _, code, message in warnings if code != ER_DUP_ENTRY]
+        # SHOW WARNINGS is capped at max_error_count, so unlisted warnings count as rejected
+        if rejected or len(warnings) < warning_count:
+            detail = rejected[0] if rejected else "see SHOW WARNINGS"
+            raise RuntimeError(
+                f"LOAD DATA raised {warning_count} warnings for {processed} rows, "
+                f"{processed - inserted} skipped ({detail})"
+            )
+
+    return processed, inserted
+
+
+def load_dam_resources(records: Iterable[dict], incremental: bool = True):
     """
     Append new records to dam_resources table.
     Skips records that already exist (same dam_id + date).
+    Records are validated and inserted in batches as they are read, so records may be a stream.
+    A large first load into an empty MySQL table is seeded with LOAD DATA instead.
+
+    With incremental=True, records dated on or before a dam's latest loaded date
+    are dropped before they are sent and reported separately. This assumes each
+    dam's dates only move forward between loads, which holds for the monthly
+    extract windows. Pass incremental=False (--backfill on the command line) to
+    load older dates too; the unique key still skips any rows that already exist.
     """
     with DatabaseConnection() as db:
         cursor = db.get_cursor()
 
         try:
-            # Group records by dam_id for efficient duplicate checking
-            records_by_dam = {}
-            for record in records:
-                dam_id = record["dam_id"]
-                if dam_id not in records_by_dam:
-                    records_by_dam[dam_id] = []
-                records_by_dam[dam_id].append(record)
-
-            insert_sql = """
-                INSERT INTO dam_resources
-                (dam_id, date, storage_volume, percentage_full, storage_inflow, storage_release)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-
+            records = iter(records)
+            bulk_seed_possible = False
+            if db.provider == "local":
+                # Look ahead just far enough to know whether the bulk seed applies;
+                # other providers batch the stream directly
+                head = list(islice(records, BULK_SEED_THRESHOLD))
+                bulk_seed_possible = len(head) == BULK_SEED_THRESHOLD
+                records = chain(head, records)
+            batches = iter_batches(records)
+
+            processed = 0
             inserted = 0
-            skipped = 0
-
-            for dam_id, dam_records in records_by_dam.items():
-                existing_dates = get_existing_dates(cursor, dam_id)
-
-                for record in dam_records:
-                    record_date = record["date"]
-                    # Convert string date to date object for comparison if needed
-                    if isinstance(record_date, str):
-                        from datetime import datetime
-                        record_date_obj = datetime.strptime(record_date, "%Y-%m-%d").date()
-                    else:
-                        record_date_obj = record_date
-
-                    if record_date_obj in existing_dates:
-                        skipped += 1
-                        continue
-
-                    cursor.execute(insert_sql, (
-                        record["dam_id"],
-                        record["date"],
-                        record.get("storage_volume"),
-                        record.get("percentage_full"),
-                        record.get("storage_inflow"),
-                        record.get("storage_release"),
-                    ))
-                    inserted += 1
+            older = 0
+
+            # Foreign key and unique checks stay on: dams are not guaranteed to
+            # exist here, and duplicates are skipped through the unique key
+            with db.bulk_load_session(cursor):
+                if bulk_seed_possible and can_bulk_seed(cursor):
+                    logger.info("✓ Empty table, seeding with LOAD DATA LOCAL INFILE")
+                    processed, inserted = bulk_seed(cursor, batches)
+                else:
+                    last_loaded = get_last_loaded_dates(cursor) if incremental else {}
+                    for batch in batches:
+                        processed += len(batch)
+                        # ISO dates order chronologically as strings, so already
+                        # loaded records are dropped before they are validated
+                        new_records = [
+                            record for record in batch
+                            if str(record.get("date")) > last_loaded.get(record.get("dam_id"), "")
+                        ]
+                        older += len(batch) - len(new_records)
+                        inserted += db.insert_many(cursor, INSERT_SQL[db.provider], to_rows(new_records))
+
+            skipped = processed - older - inserted
 
             db.commit()
-            print(f"✓ Inserted {inserted} new records into dam_resources")
-            if skipped > 0:
-                print(f"  Skipped {skipped} existing records (already in database)")
+            logger.info(
+                f"✓ Inserted {inserted} new records into dam_resources "
+                f"({processed} processed, {older} older than last loaded date, "
+                f"{skipped} already in database)"
+            )
 
+        except ValidationError as e:
+            db.rollback()
+            raise RuntimeError(f"Invalid dam_resources record: {e}")
         except Exception as e:
             db.rollback()
             raise RuntimeError(f"Database error: {e}")
@@ -86,7 +213,21 @@ def load_dam_resources(records: list[dict]):
             cursor.close()
 
 
+def parse_args(argv=None):
+    """Parse command line arguments, shared with scripts/db_seed_dam_resources.py."""
+    parser = argparse.ArgumentParser(description="Load dam resources into the database")
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Also load records dated on or before each dam's latest loaded date"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     print("=" * 60)
     print("Load Dam Resources to Database")
     print("=" * 60)
@@ -96,13 +237,8 @@ def main():
         print("Run transform/transform_dam_resources.py first.")
         exit(1)
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        records = json.load(f)
-
-    print(f"Found {len(records)} records to process")
-
     try:
-        load_dam_resources(records)
+        load_dam_resources(iter_records(INPUT_FILE), incremental=not args.backfill)
         print("=" * 60)
         print("✓ COMPLETE")
         print("=" * 60)
@@ -2,82 +2,115 @@
 
 import os
 import sys
-import json
+import logging
+import orjson
+from pydantic import ValidationError
 
 # Add scripts directory to path for imports
 PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+sys.path.insert(0, PROJECT_ROOT)
 
 from db_utils import DatabaseConnection
+from schemas import LatestDataList, LatestDataRecord
 
 INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "output_data", "dams_resources_latest.json")
 
-
-def ensure_dams_exist(cursor, records: list[dict]):
+logger = logging.getLogger(__name__)
+
+INSERT_DAMS_SQL = {
+    "local": "INSERT IGNORE INTO dams (dam_id, dam_name) VALUES (%s, %s)",
+    "supabase": "INSERT INTO dams (dam_id, dam_name) VALUES (%s, %s) ON CONFLICT (dam_id) DO NOTHING",
+}
+
+UPSERT_SQL = {
+    "local": (
+        "INSERT INTO latest_data "
+        "(dam_id, dam_name, date, storage_volume, percentage_full, storage_inflow, storage_release) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE "
+        "dam_name = VALUES(dam_name), date = VALUES(date), "
+        "storage_volume = VALUES(storage_volume), percentage_full = VALUES(percentage_full), "
+        "storage_inflow = VALUES(storage_inflow), storage_release = VALUES(storage_release)"
+    ),
+    "supabase": (
+        "INSERT INTO latest_data "
+        "(dam_id, dam_name, date, storage_volume, percentage_full, storage_inflow, storage_release) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+        "ON CONFLICT (dam_id) DO UPDATE SET "
+        "dam_name = EXCLUDED.dam_name, date = EXCLUDED.date, "
+        "storage_volume = EXCLUDED.storage_volume, percentage_full = EXCLUDED.percentage_full, "
+        "storage_inflow = EXCLUDED.storage_inflow, storage_release = EXCLUDED.storage_release"
+    ),
+}
+
+
+def ensure_dams_exist(db, cursor, records: list[LatestDataRecord]) -> int:
     """
     Ensure all dams in records exist in the dams table.
     Inserts missing dams to satisfy foreign key constraint.
+    Returns the number of dams added.
     """
-    # Get existing dam_ids
-    cursor.execute("SELECT dam_id FROM dams")
-    existing_dams = {row[0] for row in cursor.fetchall()}
-
-    # Find and insert missing dams
-    dams_to_insert = {}
-    for record in records:
-        dam_id = record["dam_id"]
-        if dam_id not in existing_dams and dam_id not in dams_to_insert:
-            dams_to_insert[dam_id] = record["dam_name"]
-
-    if dams_to_insert:
-        insert_dam_sql = """
-            INSERT INTO dams (dam_id, dam_name)
-            VALUES (%s, %s)
-        """
-        for dam_id, dam_name in dams_to_insert.items():
-            cursor.execute(insert_dam_sql, (dam_id, dam_name))
-        print(f"✓ Added {len(dams_to_insert)} new dams to dams table")
+    # Existing dams are skipped by the dam_id primary key
+    dams = {record.dam_id: record.dam_name for record in records}
+    return db.insert_many(cursor, INSERT_DAMS_SQL[db.provider], list(dams.items()))
 
 
 def load_latest_data(records: list[dict]):
     """
     Replace all data in the latest_data table with new records.
     Ensures dams exist in dams table first (foreign key constraint).
+    Records are validated against LatestDataRecord before anything is written.
     """
     with DatabaseConnection() as db:
         cursor = db.get_cursor()
 
         try:
+            records = LatestDataList.validate_python(records)
+
             # Ensure all dams exist in dams table
-            ensure_dams_exist(cursor, records)
-
-            # Clear existing data
-            cursor.execute("DELETE FROM latest_data")
-            print(f"✓ Cleared existing latest_data records")
-
-            # Insert new records
-            insert_sql = """
-                INSERT INTO latest_data
-                (dam_id, dam_name, date, storage_volume, percentage_full, storage_inflow, storage_release)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-
-            inserted = 0
-            for record in records:
-                cursor.execute(insert_sql, (
-                    record["dam_id"],
-                    record["dam_name"],
-                    record["date"],
-                    record.get("storage_volume"),
-                    record.get("percentage_full"),
-                    record.get("storage_inflow"),
-                    record.get("storage_release"),
-                ))
-                inserted += 1
+            added = ensure_dams_exist(db, cursor, records)
+
+            # Every referenced dam now exists, so the per-row foreign key
+            # lookup can be skipped for the upsert
+            with db.bulk_load_session(cursor, foreign_key_checks=False):
+                # Upsert on the dam_id primary key rather than DELETE + INSERT,
+                # so unchanged dams are rewritten in place within one transaction
+                rows = [
+                    (
+                        record.dam_id,
+                        record.dam_name,
+                        record.date,
+                        record.storage_volume,
+                        record.percentage_full,
+                        record.storage_inflow,
+                        record.storage_release,
+                    )
+                    for record in records
+                ]
+                db.insert_many(cursor, UPSERT_SQL[db.provider], rows)
+
+                # Remove dams no longer present in the latest data
+                dam_ids = [row[0] for row in rows]
+                if dam_ids:
+                    placeholders = ", ".join(["%s"] * len(dam_ids))
+                    cursor.execute(
+                        f"DELETE FROM latest_data WHERE dam_id NOT IN ({placeholders})",
+                        tuple(dam_ids)
+                    )
+                else:
+                    cursor.execute("DELETE FROM latest_data")
+                removed = cursor.rowcount
 
             db.commit()
-            print(f"✓ Inserted {inserted} records into latest_data")
+            logger.info(
+                f"✓ Upserted {len(rows)} records into latest_data "
+                f"({added} new dams added, {removed} stale records removed)"
+            )
 
+        except ValidationError as e:
+            db.rollback()
+            raise RuntimeError(f"Invalid latest_data record: {e}")
         except Exception as e:
             db.rollback()
             raise RuntimeError(f"Database error: {e}")
@@ -86,6 +119,8 @@ def load_latest_data(records: list[dict]):
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     print("=" * 60)
     print("Load Latest Data to Database")
     print("=" * 60)
@@ -95,8 +130,8 @@ def main():
         print("Run transform/transform_dam_resources_latest.py first.")
         exit(1)
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        records = json.load(f)
+    with open(INPUT_FILE, "rb") as f:
+        records = orjson.loads(f.read())
 
     print(f"Found {len(records)} records to load")
 
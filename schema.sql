@@ -19,6 +19,17 @@ CREATE TABLE dam_resources (
     percentage_full DECIMAL(6, 2),
     storage_inflow DECIMAL(10, 3),
     storage_release DECIMAL(10, 3),
-    FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
+    FOREIGN KEY (dam_id) REFERENCES dams(dam_id),
+    UNIQUE KEY uq_dam_date (dam_id, date)
 );
 
+
+-- Migration for databases created before uq_dam_date existed.
+-- The loader relies on this key (ON DUPLICATE KEY UPDATE) to skip (dam_id, date) rows
+-- that are already loaded, and it also indexes date lookups by dam_id.
+-- Remove any existing duplicates first, keeping the oldest row.
+
+-- DELETE dr1 FROM dam_resources dr1
+-- JOIN dam_resources dr2
+--   ON dr1.dam_id = dr2.dam_id AND dr1.date = dr2.date AND dr1.resource_id > dr2.resource_id;
+-- ALTER TABLE dam_resources ADD UNIQUE KEY uq_dam_date (dam_id, date);
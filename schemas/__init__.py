@@ -1,5 +1,5 @@
 # schemas/__init__.py
 
-from .models import LatestDataRecord, DamResourceRecord
+from .models import LatestDataRecord, DamResourceRecord, LatestDataList, DamResourceList
 
-__all__ = ["LatestDataRecord", "DamResourceRecord"]
+__all__ = ["LatestDataRecord", "DamResourceRecord", "LatestDataList", "DamResourceList"]
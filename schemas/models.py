@@ -1,7 +1,7 @@
 # schemas/models.py
 
 from datetime import date
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class LatestDataRecord(BaseModel):
@@ -15,13 +15,6 @@ class LatestDataRecord(BaseModel):
     storage_inflow: float | None = None
     storage_release: float | None = None
 
-    @field_validator("date", mode="before")
-    @classmethod
-    def parse_date(cls, v):
-        if isinstance(v, str):
-            return date.fromisoformat(v)
-        return v
-
 
 class DamResourceRecord(BaseModel):
     """Schema for dam_resources table records."""
@@ -33,9 +26,7 @@ class DamResourceRecord(BaseModel):
     storage_inflow: float | None = None
     storage_release: float | None = None
 
-    @field_validator("date", mode="before")
-    @classmethod
-    def parse_date(cls, v):
-        if isinstance(v, str):
-            return date.fromisoformat(v)
-        return v
+
+# Validate whole lists in one call; much faster than constructing models one by one
+LatestDataList = TypeAdapter(list[LatestDataRecord])
+DamResourceList = TypeAdapter(list[DamResourceRecord])
@@ -2,14 +2,22 @@
 
 import os
 import sys
-import subprocess
+import logging
+import orjson
 from dotenv import load_dotenv
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 LOAD_SCRIPT = "load/load_latest_data.py"
 
+# Import the loader directly instead of spawning a second interpreter for it
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "load"))
+
+from load_latest_data import INPUT_FILE, load_latest_data
+
 
 def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     env_path = os.path.join(PROJECT_ROOT, ".env")
     if os.path.exists(env_path):
         load_dotenv(env_path)
@@ -19,18 +27,22 @@ def main() -> None:
     port = os.getenv("DB_PORT", "3306")
     print(f"Target DB: {db} at {host}:{port}")
 
-    full_path = os.path.join(PROJECT_ROOT, LOAD_SCRIPT)
-    if not os.path.isfile(full_path):
-        print(f"✗ Missing: {LOAD_SCRIPT}")
+    if not os.path.isfile(INPUT_FILE):
+        print(f"✗ Input file not found: {INPUT_FILE}")
+        print("Run transform/transform_dam_resources_latest.py first.")
         sys.exit(1)
 
+    with open(INPUT_FILE, "rb") as f:
+        records = orjson.loads(f.read())
+
     print(f"\n{'=' * 60}")
     print(f"Running {LOAD_SCRIPT}")
     print("=" * 60)
-    result = subprocess.run([sys.executable, full_path], cwd=PROJECT_ROOT)
-    if result.returncode != 0:
-        print(f"✗ {LOAD_SCRIPT} failed with exit code {result.returncode}")
-        sys.exit(result.returncode)
+    try:
+        load_latest_data(records)
+    except RuntimeError as e:
+        print(f"✗ {LOAD_SCRIPT} failed: {e}")
+        sys.exit(1)
 
     print("\n" + "=" * 60)
     print("✓ Latest data load completed successfully.")
@@ -44,26 +44,6 @@ def get_row_count(cursor, table_name):
     return cursor.fetchone()[0]
 
 
-def get_latest_date(cursor, table_name, date_column="date"):
-    """Get the most recent date from a table."""
-    try:
-        cursor.execute(f"SELECT MAX({date_column}) FROM {table_name}")
-        result = cursor.fetchone()[0]
-        return result if result else "No data"
-    except Error:
-        return "N/A"
-
-
-def get_oldest_date(cursor, table_name, date_column="date"):
-    """Get the oldest date from a table."""
-    try:
-        cursor.execute(f"SELECT MIN({date_column}) FROM {table_name}")
-        result = cursor.fetchone()[0]
-        return result if result else "No data"
-    except Error:
-        return "N/A"
-
-
 def check_latest_data(cursor):
     """Check latest_data table status."""
     print("\n" + "=" * 60)
@@ -74,19 +54,21 @@ def check_latest_data(cursor):
         print("✗ Table does not exist")
         return False
 
-    row_count = get_row_count(cursor, "latest_data")
-    latest_date = get_latest_date(cursor, "latest_data")
+    # Row count, latest date and NULL critical fields in a single scan
+    cursor.execute(
+        "SELECT COUNT(*), MAX(date), "
+        "SUM(CASE WHEN dam_id IS NULL OR date IS NULL THEN 1 ELSE 0 END) "
+        "FROM latest_data"
+    )
+    row_count, latest_date, null_count = cursor.fetchone()
 
     print(f"  Row count:    {row_count}")
-    print(f"  Latest date:  {latest_date}")
+    print(f"  Latest date:  {latest_date or 'No data'}")
 
     if row_count == 0:
         print("✗ Table is empty - run load/load_latest_data.py")
         return False
 
-    # Check for any NULL critical fields
-    cursor.execute("SELECT COUNT(*) FROM latest_data WHERE dam_id IS NULL OR date IS NULL")
-    null_count = cursor.fetchone()[0]
     if null_count > 0:
         print(f"⚠ Warning: {null_count} rows with NULL dam_id or date")
 
@@ -104,20 +86,19 @@ def check_dam_resources(cursor):
         print("✗ Table does not exist")
         return False
 
-    row_count = get_row_count(cursor, "dam_resources")
-    oldest_date = get_oldest_date(cursor, "dam_resources")
-    latest_date = get_latest_date(cursor, "dam_resources")
+    # Row count, date range and unique dams in a single scan
+    cursor.execute(
+        "SELECT COUNT(*), MIN(date), MAX(date), COUNT(DISTINCT dam_id) FROM dam_resources"
+    )
+    row_count, oldest_date, latest_date, dam_count = cursor.fetchone()
 
     print(f"  Row count:    {row_count}")
-    print(f"  Date range:   {oldest_date} to {latest_date}")
+    print(f"  Date range:   {oldest_date or 'No data'} to {latest_date or 'No data'}")
 
     if row_count == 0:
         print("✗ Table is empty - run load/load_dam_resources.py")
         return False
 
-    # Count unique dams
-    cursor.execute("SELECT COUNT(DISTINCT dam_id) FROM dam_resources")
-    dam_count = cursor.fetchone()[0]
     print(f"  Unique dams:  {dam_count}")
 
     print("✓ Load successful")
@@ -4,12 +4,17 @@ Supports MySQL (local) and PostgreSQL (Supabase) based on DB_PROVIDER env variab
 """
 
 import os
+import re
 import sys
+import tempfile
+from contextlib import contextmanager
+from itertools import chain
 from dotenv import load_dotenv
 
 # Conditional imports based on what's needed
 try:
     import mysql.connector
+    import mysql.connector.pooling
     from mysql.connector import Error as MySQLError
 except ImportError:
     mysql = None
@@ -22,6 +27,21 @@ except ImportError:
     psycopg2 = None
     PostgresError = None
 
+# Rows sent per INSERT statement by DatabaseConnection.insert_many
+BATCH_SIZE = 1000
+
+# Connections kept open per MySQL pool. The pool opens all of them up front, and
+# loaders in one process run one at a time, each returning its connection on
+# close, so a single connection is enough; connect() opens a dedicated one if
+# the pooled connection is ever still in use
+POOL_SIZE = 1
+
+# The only directory MySQL connections may send LOAD DATA LOCAL INFILE files from
+LOCAL_INFILE_DIR = os.path.join(tempfile.gettempdir(), "etl_water_dashboard")
+
+# Matches the "(%s, %s, ...)" placeholder group of a single-row INSERT
+VALUES_GROUP = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+
 
 class DatabaseConnection:
     """
@@ -29,16 +49,23 @@ class DatabaseConnection:
     Automatically selects the correct driver based on DB_PROVIDER env variable.
     """
 
+    # Shared by all instances so repeated loads in one process parse .env
+    # once and reuse open MySQL connections instead of reconnecting
+    _loaded_env_paths = set()
+    _pools = {}
+
     def __init__(self, env_path=None):
         """Initialize database connection configuration."""
         if env_path is None:
             project_root = os.path.join(os.path.dirname(__file__), "..")
             env_path = os.path.join(project_root, ".env")
+        env_path = os.path.abspath(env_path)
 
-        if not os.path.exists(env_path):
-            raise RuntimeError(f"Error: .env file not found at {env_path}")
-
-        load_dotenv(env_path)
+        if env_path not in DatabaseConnection._loaded_env_paths:
+            if not os.path.exists(env_path):
+                raise RuntimeError(f"Error: .env file not found at {env_path}")
+            load_dotenv(env_path)
+            DatabaseConnection._loaded_env_paths.add(env_path)
 
         self.provider = os.getenv("DB_PROVIDER", "local").lower()
         self.connection = None
@@ -57,6 +84,7 @@ class DatabaseConnection:
                 "database": os.getenv("DB_NAME"),
                 "user": os.getenv("DB_USER"),
                 "password": os.getenv("DB_PASSWORD"),
+                "allow_local_infile_in_path": LOCAL_INFILE_DIR,
             }
         elif self.provider == "supabase":
             # PostgreSQL Supabase database - use SUPABASE_DB_* variables
@@ -68,6 +96,19 @@ class DatabaseConnection:
                 "password": os.getenv("SUPABASE_DB_PASSWORD"),
             }
 
+    def get_pool(self, params):
+        """Get the shared MySQL connection pool for params, creating it on first use."""
+        key = tuple(sorted(params.items()))
+        pool = DatabaseConnection._pools.get(key)
+        if pool is None:
+            pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"etl_{len(DatabaseConnection._pools)}",
+                pool_size=POOL_SIZE,
+                **params,
+            )
+            DatabaseConnection._pools[key] = pool
+        return pool
+
     def connect(self):
         """Establish database connection."""
         params = self.get_connection_params()
@@ -81,7 +122,12 @@ class DatabaseConnection:
             if self.provider == "local":
                 if mysql is None:
                     raise RuntimeError("mysql-connector-python is not installed. Run: pip install mysql-connector-python")
-                self.connection = mysql.connector.connect(**params)
+                try:
+                    # Closing a pooled connection returns it to the pool
+                    self.connection = self.get_pool(params).get_connection()
+                except mysql.connector.errors.PoolError:
+                    # All pooled connections are in use, open a dedicated one
+                    self.connection = mysql.connector.connect(**params)
             elif self.provider == "supabase":
                 if psycopg2 is None:
                     raise RuntimeError("psycopg2 is not installed. Run: pip install psycopg2-binary")
@@ -98,6 +144,64 @@ class DatabaseConnection:
             self.connect()
         return self.connection.cursor()
 
+    def insert_many(self, cursor, insert_sql: str, rows: list[tuple], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Insert rows in batches of batch_size and return the number of rows affected.
+
+        insert_sql must contain a single VALUES placeholder group, e.g.
+        "INSERT INTO t (a, b) VALUES (%s, %s)". mysql-connector rewrites
+        executemany() into one multi-row INSERT per batch; psycopg2 does not,
+        so for Supabase the multi-row statement is built here instead.
+
+        The mysql-connector rewrite only happens when the statement matches its
+        INSERT ... VALUES (...) pattern; otherwise it silently falls back to one
+        execute() per row. Some connector releases have regressed on statements
+        split across lines, so keep insert_sql as a single-line string with no
+        comments and "VALUES (" directly followed by the placeholders.
+        """
+        if not rows:
+            return 0
+
+        placeholder = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+        affected = 0
+
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            if self.provider == "local":
+                cursor.executemany(insert_sql, chunk)
+            else:
+                values = ", ".join([placeholder] * len(chunk))
+                cursor.execute(
+                    VALUES_GROUP.sub(values, insert_sql, count=1),
+                    tuple(chain.from_iterable(chunk)),
+                )
+            affected += cursor.rowcount
+
+        return affected
+
+    @contextmanager
+    def bulk_load_session(self, cursor, foreign_key_checks: bool = True):
+        """
+        Run a bulk load inside one explicit transaction.
+
+        Autocommit is turned off so all batches are committed together by the
+        caller. On MySQL, foreign_key_checks=False also skips the parent-row
+        lookup on every inserted row; only pass it when the caller has already
+        guaranteed that the referenced rows exist. The setting is restored
+        before the caller commits.
+        """
+        if self.connection.autocommit:
+            self.connection.autocommit = False
+        relax_fk = self.provider == "local" and not foreign_key_checks
+
+        if relax_fk:
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+        try:
+            yield
+        finally:
+            if relax_fk:
+                cursor.execute("SET SESSION foreign_key_checks = 1")
+
     def commit(self):
         """Commit the current transaction."""
         if self.connection:
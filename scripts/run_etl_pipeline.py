@@ -6,33 +6,85 @@ Master script to run the full ETL pipeline with tests at each stage.
 Usage:
     python scripts/run_etl_pipeline.py           # Run full pipeline
     python scripts/run_etl_pipeline.py --no-tests  # Skip tests
+    python scripts/run_etl_pipeline.py --no-cache  # Rerun cached scripts
+    python scripts/run_etl_pipeline.py --isolate   # Run each script in its own interpreter
+    python scripts/run_etl_pipeline.py --parallel-tests  # Run tests with pytest-xdist
 """
 
 import os
 import sys
+import glob
+import json
+import logging
+import hashlib
+import threading
+import importlib.util
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from dotenv import dotenv_values
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-# Script definitions for each stage
+# Script definitions for each stage, as groups that run one after another.
+# Scripts within a group are independent and run concurrently.
 EXTRACT_SCRIPTS = [
-    "extract/api_calls/fetch_token.py",
-    "extract/api_calls/fetch_dam_resources_latest.py",
-    "extract/api_calls/fetch_dam_resources.py",
+    ["extract/api_calls/fetch_token.py"],
+    [
+        "extract/api_calls/fetch_dam_resources_latest.py",
+        "extract/api_calls/fetch_dam_resources.py",
+    ],
 ]
 
 TRANSFORM_SCRIPTS = [
-    "transform/transform_dam_resources_latest.py",
-    "transform/transform_dam_resources.py",
+    [
+        "transform/transform_dam_resources_latest.py",
+        "transform/transform_dam_resources.py",
+    ],
 ]
 
+# dam_resources references dams that load_latest_data inserts, so run in order
 LOAD_SCRIPTS = [
-    "load/load_latest_data.py",
-    "load/load_dam_resources.py",
+    ["load/load_latest_data.py"],
+    ["load/load_dam_resources.py"],
 ]
 
+# Scripts whose output depends only on their source and input files, as
+# (input glob patterns, output files). They are skipped when nothing has
+# changed since their last run. Extract scripts call the API and load scripts
+# write to the database, so neither can be cached this way.
+CACHEABLE_SCRIPTS = {
+    "transform/transform_dam_resources_latest.py": (
+        ["data/input_data/dams_resources_latest.json"],
+        ["data/output_data/dams_resources_latest.json"],
+    ),
+    "transform/transform_dam_resources.py": (
+        ["data/input_data/dam_resources/*.json"],
+        ["data/output_data/dam_resources.json"],
+    ),
+}
+
+CACHE_INDEX = os.path.join(PROJECT_ROOT, ".etl_cache", "index.json")
+
+# Files read by the load stage. The stage's scripts are skipped when these, the
+# code that loads them and the target database are unchanged since the last
+# successful load.
+LOAD_INPUTS = [
+    "data/output_data/dams_resources_latest.json",
+    "data/output_data/dam_resources.json",
+]
+
+LOAD_SOURCES = [script for group in LOAD_SCRIPTS for script in group] + [
+    "scripts/db_utils.py",
+    "schemas/models.py",
+]
+
+LAST_LOADED = os.path.join(PROJECT_ROOT, ".etl_cache", "last_loaded.json")
+
+# Scripts in a group run on separate threads and may update the index together
+cache_lock = threading.Lock()
+
 TEST_FILES = {
     "extract": "tests/test_extract.py",
     "transform": "tests/test_transform.py",
@@ -40,6 +92,91 @@ TEST_FILES = {
 }
 
 
+class TaggedLines:
+    """
+    Writer that forwards complete lines to a stream, each prefixed with a tag.
+    Each line goes out in a single write, so lines from scripts running
+    concurrently interleave but are never split.
+    """
+
+    def __init__(self, stream, tag: str):
+        self.stream = stream
+        self.tag = tag
+        self.pending = ""
+
+    def write(self, text):
+        *lines, self.pending = (self.pending + text).split("\n")
+        for line in lines:
+            self.stream.write(f"{self.tag} {line}\n")
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            self.stream.write(f"{self.tag} {self.pending}\n")
+            self.pending = ""
+        self.stream.flush()
+
+
+class ThreadOutput:
+    """
+    Stand-in for sys.stdout that sends writes from a thread with a registered
+    writer to that writer, and everything else to the real stream. This lets
+    scripts running in-process on separate threads have their output tagged.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.writers = {}
+
+    def write(self, text):
+        writer = self.writers.get(threading.get_ident())
+        if writer is None:
+            return self.stream.write(text)
+        return writer.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class ProcessGroup:
+    """
+    Subprocesses of one script group, tracked so the rest of the group can be
+    stopped as soon as one script fails instead of running to completion.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes = []
+        self.aborted = False
+
+    def start(self, args: list):
+        """Start a subprocess with piped output, or return None if the group was aborted."""
+        with self.lock:
+            if self.aborted:
+                return None
+            process = subprocess.Popen(
+                args,
+                cwd=PROJECT_ROOT,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+            )
+            self.processes.append(process)
+            return process
+
+    def abort(self):
+        """Terminate every process in the group that is still running."""
+        with self.lock:
+            self.aborted = True
+            for process in self.processes:
+                if process.poll() is None:
+                    process.terminate()
+
+
 def print_header(title: str):
     """Print a formatted header."""
     print("\n" + "=" * 70)
@@ -52,29 +189,266 @@ def print_subheader(title: str):
     print(f"\n--- {title} ---")
 
 
-def run_script(script_path: str) -> bool:
-    """Run a Python script and return success status."""
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(script_path: str) -> str:
+    """Hash a cacheable script's source together with the contents of its inputs."""
+    input_patterns, _ = CACHEABLE_SCRIPTS[script_path]
+    key = hashlib.blake2b()
+
+    with open(os.path.join(PROJECT_ROOT, script_path), "rb") as f:
+        key.update(f.read())
+
+    for pattern in input_patterns:
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, pattern))):
+            key.update(os.path.relpath(path, PROJECT_ROOT).encode())
+            key.update(file_digest(path).encode())
+
+    return key.hexdigest()
+
+
+def load_cache_index() -> dict:
+    """Load the cache index, treating a missing or unreadable index as empty."""
+    try:
+        with open(CACHE_INDEX, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_cache_hit(script_path: str, key: str) -> bool:
+    """Check the script last ran with this key and its outputs are unchanged since."""
+    with cache_lock:
+        entry = load_cache_index().get(script_path)
+
+    if entry is None or entry["key"] != key:
+        return False
+
+    for path, digest in entry["outputs"].items():
+        full_path = os.path.join(PROJECT_ROOT, path)
+        if not os.path.exists(full_path) or file_digest(full_path) != digest:
+            return False
+
+    return True
+
+
+def record_cache_entry(script_path: str, key: str):
+    """
+    Store the key and output digests of a script that just succeeded.
+    Scripts can exit successfully without writing their outputs (e.g. when an
+    input is missing), so nothing is cached unless every output exists.
+    """
+    _, outputs = CACHEABLE_SCRIPTS[script_path]
+    try:
+        entry = {
+            "key": key,
+            "outputs": {path: file_digest(os.path.join(PROJECT_ROOT, path)) for path in outputs},
+        }
+    except OSError:
+        return
+
+    with cache_lock:
+        index = load_cache_index()
+        index[script_path] = entry
+        os.makedirs(os.path.dirname(CACHE_INDEX), exist_ok=True)
+        with open(CACHE_INDEX, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+
+
+def get_load_state():
+    """
+    Digest each load input and the code that loads it, and identify the
+    target database, or return None if a file is missing. The database
+    settings are resolved the same way as in db_utils: the environment
+    first, then .env.
+    """
+    digests = {}
+    for path in LOAD_INPUTS + LOAD_SOURCES:
+        full_path = os.path.join(PROJECT_ROOT, path)
+        if not os.path.exists(full_path):
+            return None
+        digests[path] = file_digest(full_path)
+
+    inputs = {path: digests[path] for path in LOAD_INPUTS}
+    sources = {path: digests[path] for path in LOAD_SOURCES}
+
+    config = {**dotenv_values(os.path.join(PROJECT_ROOT, ".env")), **os.environ}
+    provider = config.get("DB_PROVIDER", "local").lower()
+    prefix = "SUPABASE_DB_" if provider == "supabase" else "DB_"
+    target = {
+        "provider": provider,
+        "host": config.get(f"{prefix}HOST"),
+        "port": config.get(f"{prefix}PORT"),
+        "database": config.get(f"{prefix}NAME"),
+    }
+
+    return {"inputs": inputs, "sources": sources, "target": target}
+
+
+def is_already_loaded(state: dict) -> bool:
+    """Check the last successful load used the same inputs, code and target database."""
+    try:
+        with open(LAST_LOADED, "r", encoding="utf-8") as f:
+            last_loaded = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    return all(last_loaded.get(key) == state[key] for key in ("inputs", "sources", "target"))
+
+
+def record_load(state: dict):
+    """Store the state of a load that just succeeded."""
+    os.makedirs(os.path.dirname(LAST_LOADED), exist_ok=True)
+    with open(LAST_LOADED, "w", encoding="utf-8") as f:
+        json.dump({**state, "loaded_at": datetime.now().isoformat()}, f, indent=2)
+
+
+def run_in_process(full_path: str) -> int:
+    """
+    Import a script as a module and call its main(), returning an exit code.
+    This avoids starting a new interpreter and re-importing shared dependencies
+    for every script. Scripts signal failure with exit(1), so SystemExit is
+    converted back to its exit code.
+    """
+    name = os.path.splitext(os.path.basename(full_path))[0]
+    spec = importlib.util.spec_from_file_location(name, full_path)
+    module = importlib.util.module_from_spec(spec)
+
+    # Scripts that parse arguments see the argv a subprocess would get,
+    # not the pipeline's own flags
+    argv = sys.argv
+    sys.argv = [full_path]
+    try:
+        spec.loader.exec_module(module)
+        module.main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    except Exception as e:
+        print(f"✗ Unhandled error: {e}")
+        return 1
+    finally:
+        sys.argv = argv
+
+    return 0
+
+
+def run_isolated(full_path: str, tag: str = None, group: ProcessGroup = None) -> int:
+    """
+    Run a script in a new interpreter and return its exit code.
+    With a tag, the script's output is streamed line by line with the tag
+    prefixed, and the process is started in group so it can be aborted.
+    """
+    if tag is None:
+        return subprocess.run([sys.executable, full_path], cwd=PROJECT_ROOT).returncode
+
+    # -u stops the child block-buffering its stdout on the pipe, so lines arrive as printed
+    process = group.start([sys.executable, "-u", full_path])
+    if process is None:
+        print(f"{tag} skipped, another script in the group failed")
+        return 1
+
+    for line in process.stdout:
+        print(f"{tag} {line}", end="")
+    return process.wait()
+
+
+def run_script(
+    script_path: str,
+    use_cache: bool = True,
+    isolate: bool = False,
+    group: ProcessGroup = None,
+) -> bool:
+    """
+    Run a Python script and return success status.
+    Scripts run in-process through their main() unless isolate is set.
+    When run as part of a concurrent group, each output line is tagged with
+    the script name so concurrent output can be told apart.
+    Scripts in CACHEABLE_SCRIPTS are skipped when their source, inputs and
+    outputs are unchanged since they last succeeded.
+    """
     full_path = os.path.join(PROJECT_ROOT, script_path)
 
     if not os.path.exists(full_path):
         print(f"✗ Script not found: {script_path}")
         return False
 
-    print(f"\nRunning: {script_path}")
-    result = subprocess.run(
-        [sys.executable, full_path],
-        cwd=PROJECT_ROOT
-    )
+    key = None
+    if use_cache and script_path in CACHEABLE_SCRIPTS:
+        key = cache_key(script_path)
+        if is_cache_hit(script_path, key):
+            print(f"\n✓ cache hit: {script_path} (inputs unchanged, skipped)")
+            return True
 
-    if result.returncode != 0:
-        print(f"✗ {script_path} failed with exit code {result.returncode}")
+    print(f"\nRunning: {script_path}")
+    tag = f"[{os.path.splitext(os.path.basename(script_path))[0]}]" if group else None
+
+    if isolate:
+        returncode = run_isolated(full_path, tag, group)
+    elif tag and isinstance(sys.stdout, ThreadOutput):
+        writer = sys.stdout.writers[threading.get_ident()] = TaggedLines(sys.stdout.stream, tag)
+        try:
+            returncode = run_in_process(full_path)
+        finally:
+            del sys.stdout.writers[threading.get_ident()]
+            writer.flush()
+    else:
+        returncode = run_in_process(full_path)
+
+    if returncode != 0:
+        print(f"✗ {script_path} failed with exit code {returncode}")
         return False
 
+    if key is not None:
+        record_cache_entry(script_path, key)
+
     return True
 
 
-def run_tests(test_file: str) -> bool:
-    """Run pytest on a test file and return success status."""
+def run_script_group(scripts: list, use_cache: bool = True, isolate: bool = False) -> bool:
+    """
+    Run a group of independent scripts concurrently and return success status.
+    When one script fails, the group's other subprocesses are terminated.
+    Scripts running in-process cannot be interrupted and run to completion.
+    """
+    if len(scripts) == 1:
+        return run_script(scripts[0], use_cache=use_cache, isolate=isolate)
+
+    group = ProcessGroup()
+    success = True
+
+    with ThreadPoolExecutor(max_workers=len(scripts)) as executor:
+        futures = [executor.submit(run_script, script, use_cache, isolate, group) for script in scripts]
+        for future in as_completed(futures):
+            try:
+                succeeded = future.result()
+            except Exception as e:
+                # An error outside the script itself fails this step, not the pipeline
+                print(f"✗ Unhandled error: {e}")
+                succeeded = False
+            if not succeeded and success:
+                success = False
+                group.abort()
+
+    return success
+
+
+def run_tests(test_file: str, parallel: bool = False) -> bool:
+    """
+    Run pytest on a test file and return success status.
+    With parallel, tests are spread across CPU cores with pytest-xdist. Each
+    worker re-imports dependencies and rebuilds the session fixtures, so this
+    only pays off for suites much larger than the current ones.
+    """
     full_path = os.path.join(PROJECT_ROOT, test_file)
 
     if not os.path.exists(full_path):
@@ -82,10 +456,11 @@ def run_tests(test_file: str) -> bool:
         return False
 
     print(f"\nRunning tests: {test_file}")
-    result = subprocess.run(
-        [sys.executable, "-m", "pytest", full_path, "-v", "--tb=short"],
-        cwd=PROJECT_ROOT
-    )
+    args = [sys.executable, "-m", "pytest", full_path, "-v", "--tb=short"]
+    if parallel:
+        # loadscope keeps each test class, and the fixtures it shares, on one worker
+        args += ["-n", "auto", "--dist=loadscope"]
+    result = subprocess.run(args, cwd=PROJECT_ROOT)
 
     if result.returncode != 0:
         print(f"✗ Tests failed: {test_file}")
@@ -95,25 +470,49 @@ def run_tests(test_file: str) -> bool:
     return True
 
 
-def run_stage(stage_name: str, scripts: list, test_file: str, run_tests_flag: bool) -> bool:
-    """Run all scripts for a stage and optionally run tests."""
+def run_stage(
+    stage_name: str,
+    script_groups: list,
+    test_file: str,
+    run_tests_flag: bool,
+    use_cache: bool = True,
+    isolate: bool = False,
+    parallel_tests: bool = False,
+) -> bool:
+    """
+    Run all script groups for a stage and optionally run tests.
+    The load stage's scripts are skipped when its inputs, loader code and
+    target database are unchanged since the last successful load; its tests
+    still run.
+    """
     print_header(f"{stage_name.upper()} STAGE")
 
-    # Run scripts
-    for script in scripts:
-        if not run_script(script):
-            print(f"\n✗ {stage_name.upper()} STAGE FAILED")
-            return False
+    load_state = get_load_state() if stage_name == "load" else None
+    scripts_ran = False
 
-    print(f"\n✓ All {stage_name} scripts completed")
+    if use_cache and load_state is not None and is_already_loaded(load_state):
+        print("\n✓ load skipped (inputs unchanged)")
+    else:
+        # Run script groups in order; scripts within a group run concurrently
+        for scripts in script_groups:
+            if not run_script_group(scripts, use_cache, isolate):
+                print(f"\n✗ {stage_name.upper()} STAGE FAILED")
+                return False
+
+        print(f"\n✓ All {stage_name} scripts completed")
+        scripts_ran = True
 
     # Run tests if enabled
     if run_tests_flag:
         print_subheader(f"{stage_name.capitalize()} Tests")
-        if not run_tests(test_file):
+        if not run_tests(test_file, parallel_tests):
             print(f"\n✗ {stage_name.upper()} TESTS FAILED")
             return False
 
+    # Recorded only after an actual load, so loaded_at stays the time of the last load
+    if scripts_ran and load_state is not None:
+        record_load(load_state)
+
     print(f"\n✓ {stage_name.upper()} STAGE COMPLETE")
     return True
 
@@ -130,8 +529,31 @@ def main():
         choices=["extract", "transform", "load"],
         help="Run only a specific stage"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rerun cacheable scripts and the load stage even when their inputs are unchanged"
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each script in a separate Python interpreter"
+    )
+    parser.add_argument(
+        "--parallel-tests",
+        action="store_true",
+        help="Run each stage's tests across CPU cores with pytest-xdist"
+    )
     args = parser.parse_args()
 
+    if not args.isolate:
+        # Scripts use paths relative to the project root, as they would when
+        # run by subprocess with cwd=PROJECT_ROOT
+        os.chdir(PROJECT_ROOT)
+        sys.stdout = ThreadOutput(sys.stdout)
+        # Configured here so the loaders' own basicConfig calls do not replace it
+        logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     run_tests_flag = not args.no_tests
     start_time = datetime.now()
 
@@ -151,7 +573,15 @@ def main():
 
     # Run stages
     for stage_name, scripts, test_file in stages:
-        if not run_stage(stage_name, scripts, test_file, run_tests_flag):
+        if not run_stage(
+            stage_name,
+            scripts,
+            test_file,
+            run_tests_flag,
+            not args.no_cache,
+            args.isolate,
+            args.parallel_tests,
+        ):
             print_header("PIPELINE FAILED")
             print(f"Failed at: {stage_name} stage")
             sys.exit(1)
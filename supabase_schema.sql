@@ -27,9 +27,19 @@ CREATE TABLE dam_resources (
     percentage_full DECIMAL(6, 2),
     storage_inflow DECIMAL(10, 3),
     storage_release DECIMAL(10, 3),
-    FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
+    FOREIGN KEY (dam_id) REFERENCES dams(dam_id),
+    CONSTRAINT uq_dam_date UNIQUE (dam_id, date)
 );
 
+-- Migration for databases created before uq_dam_date existed.
+-- The loader relies on this constraint (ON CONFLICT DO NOTHING) to skip
+-- (dam_id, date) rows that are already loaded, and it also indexes date
+-- lookups by dam_id. Remove any existing duplicates first, keeping the oldest row.
+
+-- DELETE FROM dam_resources a USING dam_resources b
+-- WHERE a.dam_id = b.dam_id AND a.date = b.date AND a.resource_id > b.resource_id;
+-- ALTER TABLE dam_resources ADD CONSTRAINT uq_dam_date UNIQUE (dam_id, date);
+
 CREATE TABLE specific_dam_analysis (
     dam_id VARCHAR(20),
     analysis_date DATE,
@@ -0,0 +1,92 @@
+# tests/conftest.py
+
+import os
+import orjson
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INPUT_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "input_data")
+OUTPUT_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "output_data")
+INPUT_LATEST_DATA_FILE = os.path.join(INPUT_DATA_DIR, "dams_resources_latest.json")
+INPUT_DAM_RESOURCES_DIR = os.path.join(INPUT_DATA_DIR, "dam_resources")
+OUTPUT_LATEST_DATA_FILE = os.path.join(OUTPUT_DATA_DIR, "dams_resources_latest.json")
+OUTPUT_DAM_RESOURCES_FILE = os.path.join(OUTPUT_DATA_DIR, "dam_resources.json")
+
+# Below this many files, starting worker processes costs more than parsing serially
+PARALLEL_PARSE_MIN_FILES = 200
+
+
+def load_json(path: str):
+    """Parse a JSON file, naming it in the error if it is malformed."""
+    with open(path, "rb") as f:
+        try:
+            return orjson.loads(f.read())
+        except orjson.JSONDecodeError as e:
+            # A plain ValueError also pickles cleanly back from a worker process
+            raise ValueError(f"Invalid JSON in {path}: {e}") from None
+
+
+@pytest.fixture(scope="session")
+def paths_exist():
+    """Whether each pipeline output path exists, checked once per test session."""
+    return {
+        path: os.path.exists(path)
+        for path in [
+            INPUT_LATEST_DATA_FILE,
+            INPUT_DAM_RESOURCES_DIR,
+            OUTPUT_LATEST_DATA_FILE,
+            OUTPUT_DAM_RESOURCES_FILE,
+        ]
+    }
+
+
+def load_output(paths_exist: dict, path: str):
+    """Parse a pipeline output file, skipping the requesting test if it does not exist."""
+    if not paths_exist[path]:
+        pytest.skip(f"File does not exist: {path}")
+    return load_json(path)
+
+
+# Each file is parsed once per test session and shared by every test that reads it
+
+@pytest.fixture(scope="session")
+def extract_latest_data(paths_exist):
+    """Parsed output of fetch_dam_resources_latest.py."""
+    return load_output(paths_exist, INPUT_LATEST_DATA_FILE)
+
+
+@pytest.fixture(scope="session")
+def extract_dam_resource_paths(paths_exist):
+    """Paths of the JSON files written by fetch_dam_resources.py, from one directory scan."""
+    if not paths_exist[INPUT_DAM_RESOURCES_DIR]:
+        pytest.skip("Output directory does not exist")
+
+    with os.scandir(INPUT_DAM_RESOURCES_DIR) as entries:
+        return [entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+
+
+@pytest.fixture(scope="session")
+def extract_dam_resource_files(extract_dam_resource_paths):
+    """Parsed output files of fetch_dam_resources.py, keyed by path."""
+    json_files = extract_dam_resource_paths
+    if not json_files:
+        pytest.skip("No JSON files found")
+
+    if len(json_files) < PARALLEL_PARSE_MIN_FILES:
+        return {path: load_json(path) for path in json_files}
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return dict(zip(json_files, executor.map(load_json, json_files, chunksize=16)))
+
+
+@pytest.fixture(scope="session")
+def transform_latest_data(paths_exist):
+    """Parsed output of transform_dam_resources_latest.py."""
+    return load_output(paths_exist, OUTPUT_LATEST_DATA_FILE)
+
+
+@pytest.fixture(scope="session")
+def transform_dam_resources(paths_exist):
+    """Parsed output of transform_dam_resources.py."""
+    return load_output(paths_exist, OUTPUT_DAM_RESOURCES_FILE)
@@ -1,16 +1,14 @@
 # tests/test_load.py
 
 import os
-import json
+import socket
 import pytest
+from collections import defaultdict
 import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-OUTPUT_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "output_data")
-LATEST_DATA_FILE = os.path.join(OUTPUT_DATA_DIR, "dams_resources_latest.json")
-DAM_RESOURCES_FILE = os.path.join(OUTPUT_DATA_DIR, "dam_resources.json")
 
 # Load environment variables
 load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
@@ -28,10 +26,18 @@ def get_db_config():
 
 
 def db_available():
-    """Check if database connection is available."""
+    """
+    Check if database connection is available.
+    A plain TCP connect is tried first, so an unreachable server is detected
+    quickly without waiting on the MySQL handshake.
+    """
     config = get_db_config()
     if not all([config["user"], config["password"], config["database"]]):
         return False
+    try:
+        socket.create_connection((config["host"], config["port"]), timeout=1).close()
+    except OSError:
+        return False
     try:
         conn = mysql.connector.connect(**config)
         conn.close()
@@ -40,23 +46,83 @@ def db_available():
         return False
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def db_connection():
-    """Provide a database connection for tests."""
+    """Provide one database connection shared by all tests."""
     config = get_db_config()
     conn = mysql.connector.connect(**config)
     yield conn
     conn.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def db_cursor(db_connection):
-    """Provide a database cursor for tests."""
+    """Provide one database cursor shared by all tests."""
     cursor = db_connection.cursor(buffered=True)
     yield cursor
     cursor.close()
 
 
+@pytest.fixture(autouse=True)
+def ensure_connected(db_connection):
+    """Reconnect the shared connection before a test if the server dropped it."""
+    db_connection.ping(reconnect=True, attempts=3, delay=1)
+
+
+@pytest.fixture(scope="session")
+def schema_columns(db_cursor):
+    """Column names of each ETL table, from one information_schema query."""
+    db_cursor.execute(
+        "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() "
+        "AND table_name IN ('latest_data', 'dam_resources', 'dams')"
+    )
+    columns = defaultdict(set)
+    for table, column in db_cursor.fetchall():
+        columns[table].add(column)
+    return columns
+
+
+@pytest.fixture(scope="session")
+def orphans(db_cursor):
+    """Rows in each child table whose dam_id is missing from dams, from one query."""
+    db_cursor.execute(
+        "SELECT 'latest_data', COUNT(*) FROM latest_data ld "
+        "LEFT JOIN dams d ON ld.dam_id = d.dam_id WHERE d.dam_id IS NULL "
+        "UNION ALL "
+        "SELECT 'dam_resources', COUNT(*) FROM dam_resources dr "
+        "LEFT JOIN dams d ON dr.dam_id = d.dam_id WHERE d.dam_id IS NULL"
+    )
+    return dict(db_cursor.fetchall())
+
+
+def query_stats(cursor, sql: str, keys: list) -> dict:
+    """Run a single-row aggregate query and return its values keyed by name."""
+    cursor.execute(sql)
+    return dict(zip(keys, cursor.fetchone()))
+
+
+@pytest.fixture(scope="session")
+def latest_data_stats(db_cursor):
+    """Aggregates of latest_data, computed in one query for all tests."""
+    return query_stats(
+        db_cursor,
+        "SELECT COUNT(*), COUNT(DISTINCT dam_id), MAX(date) FROM latest_data",
+        ["count", "dams", "max_date"],
+    )
+
+
+@pytest.fixture(scope="session")
+def dam_resources_stats(db_cursor):
+    """Aggregates of dam_resources, computed in one query for all tests."""
+    return query_stats(
+        db_cursor,
+        "SELECT COUNT(*), COUNT(DISTINCT dam_id), COUNT(DISTINCT dam_id, date), "
+        "MIN(date), MAX(date) FROM dam_resources",
+        ["count", "dams", "dam_dates", "min_date", "max_date"],
+    )
+
+
 # Skip all tests in this module if database is not available
 pytestmark = pytest.mark.skipif(
     not db_available(),
@@ -84,55 +150,38 @@ class TestLoadLatestData:
     def test_latest_data_table_exists(self, db_cursor):
         """Verify latest_data table exists."""
         db_cursor.execute(
-            "SELECT COUNT(*) FROM information_schema.tables "
-            "WHERE table_schema = DATABASE() AND table_name = 'latest_data'"
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = 'latest_data' LIMIT 1"
         )
-        assert db_cursor.fetchone()[0] == 1, "latest_data table does not exist"
+        assert db_cursor.fetchone() is not None, "latest_data table does not exist"
 
-    def test_latest_data_has_records(self, db_cursor):
+    def test_latest_data_has_records(self, latest_data_stats):
         """Verify latest_data table has records."""
-        db_cursor.execute("SELECT COUNT(*) FROM latest_data")
-        count = db_cursor.fetchone()[0]
-        assert count > 0, "latest_data table is empty"
+        assert latest_data_stats["count"] > 0, "latest_data table is empty"
 
-    def test_latest_data_has_required_columns(self, db_cursor):
+    def test_latest_data_has_required_columns(self, schema_columns):
         """Verify latest_data table has all required columns."""
-        db_cursor.execute(
-            "SELECT COLUMN_NAME FROM information_schema.columns "
-            "WHERE table_schema = DATABASE() AND table_name = 'latest_data'"
-        )
-        columns = {row[0] for row in db_cursor.fetchall()}
+        columns = schema_columns["latest_data"]
         required = {"dam_id", "dam_name", "date", "storage_volume", "percentage_full"}
         assert required.issubset(columns), f"Missing columns: {required - columns}"
 
-    def test_latest_data_dam_ids_are_unique(self, db_cursor):
+    def test_latest_data_dam_ids_are_unique(self, latest_data_stats):
         """Verify dam_ids are unique in latest_data."""
-        db_cursor.execute("SELECT COUNT(*) FROM latest_data")
-        total = db_cursor.fetchone()[0]
-        db_cursor.execute("SELECT COUNT(DISTINCT dam_id) FROM latest_data")
-        unique = db_cursor.fetchone()[0]
-        assert total == unique, "Duplicate dam_ids found in latest_data"
+        assert latest_data_stats["count"] == latest_data_stats["dams"], (
+            "Duplicate dam_ids found in latest_data"
+        )
 
-    def test_latest_data_matches_transform_output(self, db_cursor):
+    def test_latest_data_matches_transform_output(self, latest_data_stats, transform_latest_data):
         """Verify database record count matches transform output."""
-        if not os.path.exists(LATEST_DATA_FILE):
-            pytest.skip("Transform output file does not exist")
-
-        with open(LATEST_DATA_FILE, "r", encoding="utf-8") as f:
-            transform_data = json.load(f)
-
-        db_cursor.execute("SELECT COUNT(*) FROM latest_data")
-        db_count = db_cursor.fetchone()[0]
+        db_count = latest_data_stats["count"]
 
-        assert db_count == len(transform_data), (
-            f"Record count mismatch: DB={db_count}, transform={len(transform_data)}"
+        assert db_count == len(transform_latest_data), (
+            f"Record count mismatch: DB={db_count}, transform={len(transform_latest_data)}"
         )
 
-    def test_latest_data_dates_are_recent(self, db_cursor):
+    def test_latest_data_dates_are_recent(self, latest_data_stats):
         """Verify latest_data contains recent dates."""
-        db_cursor.execute("SELECT MAX(date) FROM latest_data")
-        max_date = db_cursor.fetchone()[0]
-        assert max_date is not None, "No dates found in latest_data"
+        assert latest_data_stats["max_date"] is not None, "No dates found in latest_data"
 
 
 class TestLoadDamResources:
@@ -141,47 +190,34 @@ class TestLoadDamResources:
     def test_dam_resources_table_exists(self, db_cursor):
         """Verify dam_resources table exists."""
         db_cursor.execute(
-            "SELECT COUNT(*) FROM information_schema.tables "
-            "WHERE table_schema = DATABASE() AND table_name = 'dam_resources'"
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = 'dam_resources' LIMIT 1"
         )
-        assert db_cursor.fetchone()[0] == 1, "dam_resources table does not exist"
+        assert db_cursor.fetchone() is not None, "dam_resources table does not exist"
 
-    def test_dam_resources_has_records(self, db_cursor):
+    def test_dam_resources_has_records(self, dam_resources_stats):
         """Verify dam_resources table has records."""
-        db_cursor.execute("SELECT COUNT(*) FROM dam_resources")
-        count = db_cursor.fetchone()[0]
-        assert count > 0, "dam_resources table is empty"
+        assert dam_resources_stats["count"] > 0, "dam_resources table is empty"
 
-    def test_dam_resources_has_required_columns(self, db_cursor):
+    def test_dam_resources_has_required_columns(self, schema_columns):
         """Verify dam_resources table has all required columns."""
-        db_cursor.execute(
-            "SELECT COLUMN_NAME FROM information_schema.columns "
-            "WHERE table_schema = DATABASE() AND table_name = 'dam_resources'"
-        )
-        columns = {row[0] for row in db_cursor.fetchall()}
+        columns = schema_columns["dam_resources"]
         required = {"dam_id", "date", "storage_volume", "percentage_full"}
         assert required.issubset(columns), f"Missing columns: {required - columns}"
 
-    def test_dam_resources_has_multiple_dams(self, db_cursor):
+    def test_dam_resources_has_multiple_dams(self, dam_resources_stats):
         """Verify dam_resources has data from multiple dams."""
-        db_cursor.execute("SELECT COUNT(DISTINCT dam_id) FROM dam_resources")
-        dam_count = db_cursor.fetchone()[0]
-        assert dam_count > 1, "Expected data from multiple dams"
+        assert dam_resources_stats["dams"] > 1, "Expected data from multiple dams"
 
-    def test_dam_resources_no_duplicate_dam_date_pairs(self, db_cursor):
+    def test_dam_resources_no_duplicate_dam_date_pairs(self, dam_resources_stats):
         """Verify no duplicate (dam_id, date) pairs in dam_resources."""
-        db_cursor.execute("SELECT COUNT(*) FROM dam_resources")
-        total = db_cursor.fetchone()[0]
-        db_cursor.execute(
-            "SELECT COUNT(*) FROM (SELECT DISTINCT dam_id, date FROM dam_resources) AS t"
+        assert dam_resources_stats["count"] == dam_resources_stats["dam_dates"], (
+            "Duplicate (dam_id, date) pairs found"
         )
-        unique = db_cursor.fetchone()[0]
-        assert total == unique, "Duplicate (dam_id, date) pairs found"
 
-    def test_dam_resources_date_range(self, db_cursor):
+    def test_dam_resources_date_range(self, dam_resources_stats):
         """Verify dam_resources has expected date range."""
-        db_cursor.execute("SELECT MIN(date), MAX(date) FROM dam_resources")
-        min_date, max_date = db_cursor.fetchone()
+        min_date, max_date = dam_resources_stats["min_date"], dam_resources_stats["max_date"]
         assert min_date is not None, "No dates found in dam_resources"
         assert max_date is not None, "No dates found in dam_resources"
         assert min_date <= max_date, "Invalid date range"
@@ -193,33 +229,20 @@ class TestDamsTable:
     def test_dams_table_exists(self, db_cursor):
         """Verify dams table exists."""
         db_cursor.execute(
-            "SELECT COUNT(*) FROM information_schema.tables "
-            "WHERE table_schema = DATABASE() AND table_name = 'dams'"
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = 'dams' LIMIT 1"
         )
-        assert db_cursor.fetchone()[0] == 1, "dams table does not exist"
+        assert db_cursor.fetchone() is not None, "dams table does not exist"
 
     def test_dams_has_records(self, db_cursor):
         """Verify dams table has records."""
-        db_cursor.execute("SELECT COUNT(*) FROM dams")
-        count = db_cursor.fetchone()[0]
-        assert count > 0, "dams table is empty"
+        db_cursor.execute("SELECT 1 FROM dams LIMIT 1")
+        assert db_cursor.fetchone() is not None, "dams table is empty"
 
-    def test_all_latest_data_dams_exist_in_dams_table(self, db_cursor):
+    def test_all_latest_data_dams_exist_in_dams_table(self, orphans):
         """Verify all dam_ids in latest_data exist in dams table."""
-        db_cursor.execute(
-            "SELECT COUNT(*) FROM latest_data ld "
-            "LEFT JOIN dams d ON ld.dam_id = d.dam_id "
-            "WHERE d.dam_id IS NULL"
-        )
-        orphans = db_cursor.fetchone()[0]
-        assert orphans == 0, f"{orphans} dam_ids in latest_data not found in dams"
+        assert orphans["latest_data"] == 0, f"{orphans['latest_data']} dam_ids in latest_data not found in dams"
 
-    def test_all_dam_resources_dams_exist_in_dams_table(self, db_cursor):
+    def test_all_dam_resources_dams_exist_in_dams_table(self, orphans):
         """Verify all dam_ids in dam_resources exist in dams table."""
-        db_cursor.execute(
-            "SELECT COUNT(*) FROM dam_resources dr "
-            "LEFT JOIN dams d ON dr.dam_id = d.dam_id "
-            "WHERE d.dam_id IS NULL"
-        )
-        orphans = db_cursor.fetchone()[0]
-        assert orphans == 0, f"{orphans} dam_ids in dam_resources not found in dams"
+        assert orphans["dam_resources"] == 0, f"{orphans['dam_resources']} dam_ids in dam_resources not found in dams"
@@ -1,11 +1,10 @@
 # tests/test_transform.py
 
 import os
-import json
 import pytest
 from pydantic import ValidationError
 
-from schemas import LatestDataRecord, DamResourceRecord
+from schemas import LatestDataList, DamResourceList
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 OUTPUT_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "output_data")
@@ -13,154 +12,97 @@ LATEST_DATA_FILE = os.path.join(OUTPUT_DATA_DIR, "dams_resources_latest.json")
 DAM_RESOURCES_FILE = os.path.join(OUTPUT_DATA_DIR, "dam_resources.json")
 
 
+def format_errors(error: ValidationError, records: list) -> str:
+    """Format list validation errors one per line, with the failing record's index and dam_id."""
+    lines = []
+    for err in error.errors():
+        if not err["loc"]:
+            # The data itself is not a list
+            lines.append(err["msg"])
+            continue
+        index, *field = err["loc"]
+        record = records[index]
+        dam_id = record.get("dam_id") if isinstance(record, dict) else None
+        lines.append(f"Record {index} (dam_id={dam_id}) {'.'.join(map(str, field))}: {err['msg']}")
+    return "\n".join(lines)
+
+
 class TestTransformLatestData:
     """Tests for transform_dam_resources_latest.py output."""
 
-    def test_output_file_exists(self):
+    def test_output_file_exists(self, paths_exist):
         """Verify the transformed latest data file exists."""
-        assert os.path.exists(LATEST_DATA_FILE), (
+        assert paths_exist[LATEST_DATA_FILE], (
             f"Output file not found: {LATEST_DATA_FILE}\n"
             "Run: python transform/transform_dam_resources_latest.py"
         )
 
-    def test_output_file_is_valid_json(self):
+    def test_output_file_is_valid_json(self, transform_latest_data):
         """Verify the output file contains valid JSON."""
-        if not os.path.exists(LATEST_DATA_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(LATEST_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        assert isinstance(data, list), "Expected a list of records"
+        assert isinstance(transform_latest_data, list), "Expected a list of records"
 
-    def test_output_has_records(self):
+    def test_output_has_records(self, transform_latest_data):
         """Verify the output file contains records."""
-        if not os.path.exists(LATEST_DATA_FILE):
-            pytest.skip("Output file does not exist")
+        assert len(transform_latest_data) > 0, "Expected at least one record"
 
-        with open(LATEST_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        assert len(data) > 0, "Expected at least one record"
-
-    def test_all_records_match_schema(self):
+    def test_all_records_match_schema(self, transform_latest_data):
         """Verify all records match the LatestDataRecord schema."""
-        if not os.path.exists(LATEST_DATA_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(LATEST_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        try:
+            LatestDataList.validate_python(transform_latest_data)
+        except ValidationError as e:
+            pytest.fail(f"Schema validation errors:\n" + format_errors(e, transform_latest_data))
 
-        errors = []
-        for i, record in enumerate(data):
-            try:
-                LatestDataRecord(**record)
-            except ValidationError as e:
-                errors.append(f"Record {i} (dam_id={record.get('dam_id')}): {e}")
-
-        assert not errors, f"Schema validation errors:\n" + "\n".join(errors)
-
-    def test_dam_ids_are_unique(self):
+    def test_dam_ids_are_unique(self, transform_latest_data):
         """Verify all dam_ids are unique in latest data."""
-        if not os.path.exists(LATEST_DATA_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(LATEST_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        dam_ids = {record["dam_id"] for record in transform_latest_data}
+        assert len(dam_ids) == len(transform_latest_data), "Duplicate dam_ids found"
 
-        dam_ids = [record["dam_id"] for record in data]
-        assert len(dam_ids) == len(set(dam_ids)), "Duplicate dam_ids found"
-
-    def test_dates_are_valid(self):
+    def test_dates_are_valid(self, transform_latest_data):
         """Verify all dates can be parsed."""
-        if not os.path.exists(LATEST_DATA_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(LATEST_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        for record in data:
-            validated = LatestDataRecord(**record)
-            assert validated.date is not None, f"Invalid date for dam_id={record['dam_id']}"
+        for validated in LatestDataList.validate_python(transform_latest_data):
+            assert validated.date is not None, f"Invalid date for dam_id={validated.dam_id}"
 
 
 class TestTransformDamResources:
     """Tests for transform_dam_resources.py output."""
 
-    def test_output_file_exists(self):
+    def test_output_file_exists(self, paths_exist):
         """Verify the transformed dam resources file exists."""
-        assert os.path.exists(DAM_RESOURCES_FILE), (
+        assert paths_exist[DAM_RESOURCES_FILE], (
             f"Output file not found: {DAM_RESOURCES_FILE}\n"
             "Run: python transform/transform_dam_resources.py"
         )
 
-    def test_output_file_is_valid_json(self):
+    def test_output_file_is_valid_json(self, transform_dam_resources):
         """Verify the output file contains valid JSON."""
-        if not os.path.exists(DAM_RESOURCES_FILE):
-            pytest.skip("Output file does not exist")
+        assert isinstance(transform_dam_resources, list), "Expected a list of records"
 
-        with open(DAM_RESOURCES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        assert isinstance(data, list), "Expected a list of records"
-
-    def test_output_has_records(self):
+    def test_output_has_records(self, transform_dam_resources):
         """Verify the output file contains records."""
-        if not os.path.exists(DAM_RESOURCES_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(DAM_RESOURCES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        assert len(data) > 0, "Expected at least one record"
+        assert len(transform_dam_resources) > 0, "Expected at least one record"
 
-    def test_all_records_match_schema(self):
+    def test_all_records_match_schema(self, transform_dam_resources):
         """Verify all records match the DamResourceRecord schema."""
-        if not os.path.exists(DAM_RESOURCES_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(DAM_RESOURCES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        errors = []
-        for i, record in enumerate(data):
-            try:
-                DamResourceRecord(**record)
-            except ValidationError as e:
-                errors.append(f"Record {i} (dam_id={record.get('dam_id')}): {e}")
-
-        assert not errors, f"Schema validation errors:\n" + "\n".join(errors)
+        try:
+            DamResourceList.validate_python(transform_dam_resources)
+        except ValidationError as e:
+            pytest.fail(f"Schema validation errors:\n" + format_errors(e, transform_dam_resources))
 
-    def test_has_multiple_dams(self):
+    def test_has_multiple_dams(self, transform_dam_resources):
         """Verify data from multiple dams is present."""
-        if not os.path.exists(DAM_RESOURCES_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(DAM_RESOURCES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        unique_dams = set(record["dam_id"] for record in data)
+        unique_dams = set(record["dam_id"] for record in transform_dam_resources)
         assert len(unique_dams) > 1, "Expected data from multiple dams"
 
-    def test_dates_are_valid(self):
+    def test_dates_are_valid(self, transform_dam_resources):
         """Verify all dates can be parsed."""
-        if not os.path.exists(DAM_RESOURCES_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(DAM_RESOURCES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        for validated in DamResourceList.validate_python(transform_dam_resources):
+            assert validated.date is not None, f"Invalid date for dam_id={validated.dam_id}"
 
-        for record in data:
-            validated = DamResourceRecord(**record)
-            assert validated.date is not None, f"Invalid date for dam_id={record['dam_id']}"
-
-    def test_no_duplicate_dam_date_pairs(self):
+    def test_no_duplicate_dam_date_pairs(self, transform_dam_resources):
         """Verify no duplicate (dam_id, date) pairs exist."""
-        if not os.path.exists(DAM_RESOURCES_FILE):
-            pytest.skip("Output file does not exist")
-
-        with open(DAM_RESOURCES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        pairs = [(record["dam_id"], record["date"]) for record in data]
-        assert len(pairs) == len(set(pairs)), "Duplicate (dam_id, date) pairs found"
+        seen = set()
+        for record in transform_dam_resources:
+            pair = (record["dam_id"], record["date"])
+            # Stop at the first duplicate instead of building every pair up front
+            assert pair not in seen, f"Duplicate (dam_id, date) pair found: {pair}"
+            seen.add(pair)
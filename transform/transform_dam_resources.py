@@ -2,6 +2,7 @@
 
 import os
 import json
+import orjson
 import glob
 
 PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
@@ -11,8 +12,8 @@ OUTPUT_FILE = os.path.join(PROJECT_ROOT, "data", "output_data", "dam_resources.j
 
 def transform_dam_resources(file_path: str) -> list[dict]:
     """Transform a dam resources file to match schema.sql format."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(file_path, "rb") as f:
+        data = orjson.loads(f.read())
 
     dam_id = data["dam_id"]
     records = []
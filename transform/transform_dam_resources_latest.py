@@ -2,6 +2,7 @@
 
 import os
 import json
+import orjson
 
 PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
 INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "input_data", "dams_resources_latest.json")
@@ -31,8 +32,8 @@ def main():
         print(f"Error: Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        input_data = json.load(f)
+    with open(INPUT_FILE, "rb") as f:
+        input_data = orjson.loads(f.read())
 
     output_data = []
     for item in input_data: